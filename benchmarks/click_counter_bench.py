@@ -0,0 +1,110 @@
+"""Microbenchmark: catalog reads under concurrent clicks.
+
+Compares the old pattern (every click takes the shared config lock to bump a
+dict entry, and readers take the same lock) with ``ClickCounter`` (clicks
+append to a lock-free queue, readers never lock, one merger thread applies
+the counts periodically).
+
+Usage::
+
+    python benchmarks/click_counter_bench.py [--seconds 3] [--writers 4] [--readers 4]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from counters import ClickCounter  # noqa: E402
+
+GAME_IDS = [f"game_{i}" for i in range(200)]
+
+
+def run(seconds, writers, readers, click, read, merger=None):
+    stop = threading.Event()
+    reads = [0] * readers
+    clicks = [0] * writers
+
+    def writer(n):
+        i = n
+        while not stop.is_set():
+            click(GAME_IDS[i % len(GAME_IDS)])
+            clicks[n] += 1
+            i += 7
+
+    def reader(n):
+        i = n
+        while not stop.is_set():
+            read(GAME_IDS[i % len(GAME_IDS)])
+            reads[n] += 1
+            i += 3
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    threads += [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    if merger is not None:
+        def merge_loop():
+            while not stop.is_set():
+                merger()
+                time.sleep(0.05)
+            merger()
+        threads.append(threading.Thread(target=merge_loop))
+
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return sum(reads) / seconds, sum(clicks) / seconds
+
+
+def bench_locked(seconds, writers, readers):
+    config = {gid: {"clicks": 0} for gid in GAME_IDS}
+    lock = threading.Lock()
+
+    def click(gid):
+        with lock:
+            config[gid]["clicks"] += 1
+
+    def read(gid):
+        with lock:
+            return config.get(gid, {})
+
+    result = run(seconds, writers, readers, click, read)
+    return result, sum(e["clicks"] for e in config.values())
+
+
+def bench_counter(seconds, writers, readers):
+    config = {gid: {"clicks": 0} for gid in GAME_IDS}
+    lock = threading.Lock()
+    counter = ClickCounter()
+
+    def merge():
+        counts = counter.drain()
+        with lock:
+            for gid, n in counts.items():
+                config[gid]["clicks"] += n
+
+    def read(gid):
+        return config.get(gid, {})
+
+    result = run(seconds, writers, readers, counter.hit, read, merger=merge)
+    return result, sum(e["clicks"] for e in config.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    for label, bench in (("config_lock + dict", bench_locked), ("ClickCounter", bench_counter)):
+        (reads, clicks), applied = bench(args.seconds, args.writers, args.readers)
+        print(f"{label:20s} reads/s={reads:>12,.0f}  clicks/s={clicks:>12,.0f}  applied={applied:,}")
+
+
+if __name__ == "__main__":
+    main()
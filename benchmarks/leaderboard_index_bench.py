@@ -0,0 +1,120 @@
+"""EXPLAIN plans and latency of the leaderboard queries before/after migration 1.
+
+Fills a synthetic ``scores`` table (one large "hot" board plus many small
+ones), then for each leaderboard query prints the plan and the mean latency
+without ``ix_scores_board``, applies the migration and measures again.
+
+Usage::
+
+    python benchmarks/leaderboard_index_bench.py [--url sqlite:////tmp/bench.db] [--rows 1000000]
+
+Use a scratch database: the ``scores`` table there is dropped and recreated.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+
+from extensions import db  # noqa: E402
+from models import Score  # noqa: E402
+from migrations import MIGRATIONS  # noqa: E402
+
+HOT_GAME = "hot_game"
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+def fill(conn, rows: int):
+    table = Score.__table__
+    hot_rows = rows // 3
+    batch = []
+
+    def push(row):
+        batch.append(row)
+        if len(batch) >= 10000:
+            conn.execute(table.insert(), batch)
+            batch.clear()
+
+    for i in range(hot_rows):
+        push({"game_id": HOT_GAME, "difficulty": "medium", "player_name": f"p{i}",
+              "score": random.randint(0, 1_000_000)})
+    for i in range(rows - hot_rows):
+        push({"game_id": f"game_{i % 400}", "difficulty": DIFFICULTIES[i % 3], "player_name": f"p{i}",
+              "score": random.randint(0, 1_000_000)})
+    if batch:
+        conn.execute(table.insert(), batch)
+
+
+def queries():
+    board = db.and_(Score.game_id == HOT_GAME, Score.difficulty == "medium")
+    return {
+        "top 50": db.select(Score.player_name, Score.score).where(board).order_by(Score.score.desc()).limit(50),
+        "rank count": db.select(db.func.count()).select_from(Score).where(board, Score.score > 500_000),
+        "total count": db.select(db.func.count()).select_from(Score).where(board),
+    }
+
+
+def explain(conn, stmt) -> str:
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    return "\n".join("    " + " | ".join(str(c) for c in row) for row in conn.exec_driver_sql(prefix + sql))
+
+
+def measure(conn, label: str, repeat: int):
+    print(f"--- {label}")
+    for name, stmt in queries().items():
+        conn.execute(stmt).fetchall()  # warm up
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(stmt).fetchall()
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f"  {name:12s} {elapsed * 1e3:9.3f} ms")
+        print(explain(conn, stmt))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    url = args.url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    db.init_app(app)
+
+    with app.app_context():
+        engine = db.engine
+        table = Score.__table__
+        board_index = next(ix for ix in table.indexes if ix.name == 'ix_scores_board')
+        with engine.begin() as conn:
+            table.drop(conn, checkfirst=True)
+            table.create(conn)
+            board_index.drop(conn)  # the schema as it was before migration 1
+            start = time.perf_counter()
+            fill(conn, args.rows)
+            print(f"inserted {args.rows:,} rows in {time.perf_counter() - start:.1f}s")
+        with engine.connect() as conn:
+            if conn.dialect.name == "mysql":
+                conn.exec_driver_sql("ANALYZE TABLE scores")
+            else:
+                conn.exec_driver_sql("ANALYZE")
+            measure(conn, "before (single-column indexes)", args.repeat)
+        with engine.begin() as conn:
+            _, description, upgrade = MIGRATIONS[0]
+            start = time.perf_counter()
+            upgrade(conn)
+            print(f"applied migration 1 ({description}) in {time.perf_counter() - start:.1f}s")
+        with engine.connect() as conn:
+            conn.exec_driver_sql("ANALYZE TABLE scores" if conn.dialect.name == "mysql" else "ANALYZE")
+            measure(conn, "after (ix_scores_board)", args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Microbenchmark: score write path, select-then-update vs. single upsert.
+
+Runs both variants against the real ``scores`` table definition on the
+database given by ``--url`` (a throw-away SQLite file by default; point it
+at a scratch MySQL schema to measure network round trips).  Half of the
+submissions are for new players and half for existing ones.
+
+Usage::
+
+    python benchmarks/score_upsert_bench.py [--url sqlite:////tmp/bench.db] [--n 2000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+
+from extensions import db  # noqa: E402
+from models import Score  # noqa: E402
+from score_store import write_best_scores  # noqa: E402
+
+
+def select_then_update(game_id, difficulty, player, score):
+    row = Score.query.filter_by(game_id=game_id, difficulty=difficulty, player_name=player).first()
+    if row is None:
+        db.session.add(Score(game_id=game_id, difficulty=difficulty, player_name=player, score=score))
+    elif score > row.score:
+        row.score = score
+    db.session.commit()
+
+
+def single_upsert(game_id, difficulty, player, score):
+    write_best_scores([(game_id, difficulty, player, score)])  # the app's write path
+    db.session.commit()
+
+
+def run(write, n, game_id):
+    players = [f"player{i}" for i in range(n // 2)]
+    timings = []
+    for i in range(n):
+        player = players[i % len(players)]  # second half re-submits existing players
+        start = time.perf_counter()
+        write(game_id, "medium", player, random.randint(0, 100000))
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--n", type=int, default=2000)
+    args = parser.parse_args()
+
+    url = args.url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        for label, write in (("select-then-update", select_then_update), ("single upsert", single_upsert)):
+            game_id = f"bench_{label.split()[0]}"
+            Score.query.filter_by(game_id=game_id).delete()
+            db.session.commit()
+            timings = run(write, args.n, game_id)
+            timings.sort()
+            print(f"{label:20s} mean={statistics.mean(timings) * 1e3:7.3f}ms  "
+                  f"p50={timings[len(timings) // 2] * 1e3:7.3f}ms  p99={timings[int(len(timings) * 0.99)] * 1e3:7.3f}ms")
+            Score.query.filter_by(game_id=game_id).delete()
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
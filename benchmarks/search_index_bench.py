@@ -0,0 +1,86 @@
+"""Microbenchmark: /api/games/search on a large synthetic catalog.
+
+Compares collecting every match and picking the most clicked ones
+(``SearchIndex.search`` + ``heapq.nsmallest``, the old handler) with
+``SearchIndex.top``, which stops at ``limit``.  Besides a few fixed queries
+(broad ones such as ``g`` or ``匿`` match most of the catalog) it sweeps every
+one- and two-character query plus a sample of longer ones and reports the
+slowest, which is the case the cut-over between the two strategies has to bound.
+
+Usage::
+
+    python benchmarks/search_index_bench.py [--games 10000] [--limit 20]
+"""
+import argparse
+import heapq
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import SearchIndex, SortedIndex  # noqa: E402
+
+WORDS = ["game", "ball", "snake", "tetris", "space", "jump", "puzzle", "racing", "golf", "maze",
+         "小游戏", "跑酷", "消除", "射击", "赛车"]
+AUTHORS = ["匿名"] * 6 + ["alice", "bob", "张三", "gamer42", "pixel_art"]
+FIXED_QUERIES = ["g", "匿", "game", "匿名", "小游戏", "ga", "tetris_1", "zzz", "e_1"]
+
+
+def build(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    search, clicks = SearchIndex(), SortedIndex()
+    for i in range(n):
+        gid = f"{rng.choice(WORDS[:10])}_{i}"
+        title = " ".join(rng.sample(WORDS, 2))
+        search.add(gid, gid, title, rng.choice(AUTHORS))
+        clicks.update(gid, (-int(rng.paretovariate(1.2) * 10),))
+    return search, clicks
+
+
+def old_top(search, clicks, query, limit):
+    matches = search.search(query)
+    return heapq.nsmallest(limit, matches, key=lambda gid: (clicks.key_of(gid) or (0,), gid))
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    search, clicks = build(args.games)
+    print(f"{args.games:,} games, limit={args.limit}")
+    print(f"{'query':12s} {'matches':>8s} {'old ms':>8s} {'top ms':>8s}")
+    for query in FIXED_QUERIES:
+        assert search.top(query, args.limit, clicks)[0] == old_top(search, clicks, query, args.limit)
+        old = timed(lambda: old_top(search, clicks, query, args.limit), args.repeat)
+        new = timed(lambda: search.top(query, args.limit, clicks), args.repeat)
+        print(f"{query:12s} {len(search.search(query)):>8,} {old:>8.3f} {new:>8.3f}")
+
+    alphabet = string.ascii_lowercase + string.digits + "_ 匿名小游戏跑酷张"
+    sweep = [a for a in alphabet] + [a + b for a in alphabet for b in alphabet]
+    rng = random.Random(1)
+    gids = clicks.ids()
+    for _ in range(500):
+        gid = rng.choice(gids)
+        start = rng.randrange(len(gid))
+        sweep.append(gid[start:start + rng.randrange(3, 8)])
+    worst = max((timed(lambda: search.top(q, args.limit, clicks), 2), q) for q in sweep)
+    print(f"slowest of {len(sweep):,} swept queries: {worst[1]!r} {worst[0]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+"""In-memory index of the single-player game catalog.
+
+Scanning ``templates/games`` and ``templates/user_games`` used to happen on
+every page view.  ``GameCatalog`` scans once, serves lookups from a dict and
+only rescans when the directory mtimes show that something changed on disk.
+Upload handlers call :meth:`GameCatalog.refresh` so their changes are visible
+immediately.
+"""
+import heapq
+import os
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from typing import Callable, Hashable, Iterator, Optional
+
+__all__ = [
+    'GameCatalog',
+    'SortedIndex',
+    'SearchIndex',
+    'DEFAULT_PREVIEW_URL',
+]
+
+# Shared fallback image under templates/games
+DEFAULT_PREVIEW_URL = "/games/preview.png"
+PREVIEW_EXTENSIONS = ("png", "jpg", "jpeg", "gif")
+
+
+class GameCatalog:
+    """Game id -> ``{name, template, user, folder, preview}`` index.
+
+    ``preview`` is resolved once per game; a missing image is cached as
+    :data:`DEFAULT_PREVIEW_URL` and only re-probed by :meth:`refresh`.
+
+    Parameters
+    ----------
+    games_dir : str
+        Folder games, one ``<game_id>/index.html`` per game.
+    legacy_dir : str or None
+        Old single-file uploads, one ``<game_id>.html`` per game.
+    base_games : dict
+        Built-in games that always win over discovered ones.
+    user_lookup : callable
+        ``game_id -> bool`` telling whether a folder game was uploaded by a user.
+        Must not block on ``config_lock`` (uploads refresh while holding it).
+    poll_interval : float
+        Minimum seconds between two mtime checks of the game directories.
+    template_prefix, url_prefix : str
+        Template folder and route prefix of folder games (``games`` / ``/game``).
+    extra_fields : callable
+        ``game_id -> dict`` of static per-game data precomputed into each folder entry.
+    """
+
+    def __init__(self, games_dir: str, legacy_dir: Optional[str] = None, *, base_games: Optional[dict] = None,
+                 user_lookup: Optional[Callable[[str], bool]] = None, poll_interval: float = 5.0,
+                 template_prefix: str = "games", url_prefix: str = "/game",
+                 extra_fields: Optional[Callable[[str], dict]] = None):
+        self.games_dir = games_dir
+        self.legacy_dir = legacy_dir
+        self.base_games = base_games or {}
+        self.user_lookup = user_lookup or (lambda game_id: False)
+        self.poll_interval = poll_interval
+        self.template_prefix = template_prefix
+        self.url_prefix = url_prefix
+        self.extra_fields = extra_fields
+
+        # Bumped on every change so callers can cache derived data.
+        self.version = 0
+
+        self._games: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._dir_mtimes: tuple = ()
+        # Folders seen without index.html yet (e.g. a copy still in progress)
+        self._pending: set[str] = set()
+        self._last_check = 0.0
+
+    # ---------------- scanning ----------------
+
+    def _stat_dirs(self) -> tuple:
+        result = []
+        for path in (self.games_dir, self.legacy_dir):
+            if path is None:
+                continue
+            try:
+                result.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                result.append(None)
+        return tuple(result)
+
+    def _resolve_preview(self, game_id: str) -> str:
+        for ext in PREVIEW_EXTENSIONS:
+            if os.path.isfile(os.path.join(self.games_dir, game_id, f"preview.{ext}")):
+                return f"{self.url_prefix}/{game_id}/preview.{ext}"
+        return DEFAULT_PREVIEW_URL
+
+    def _folder_entry(self, game_id: str, preview: Optional[str] = None) -> dict:
+        entry = {
+            "name": game_id,
+            "template": f"{self.template_prefix}/{game_id}/index.html",
+            "user": self.user_lookup(game_id),  # user-uploaded if has IP recorded
+            "folder": True,  # indicates static folder game
+            "preview": preview if preview is not None else self._resolve_preview(game_id),
+        }
+        if self.extra_fields is not None:
+            entry.update(self.extra_fields(game_id))
+        return entry
+
+    @staticmethod
+    def _legacy_entry(game_id: str, fname: str) -> dict:
+        return {
+            "name": game_id,
+            "template": f"user_games/{fname}",
+            "user": True,
+            "folder": False,
+            "preview": DEFAULT_PREVIEW_URL,
+        }
+
+    def rebuild(self):
+        """Full rescan of both game directories.
+
+        Games already indexed keep their resolved preview; only new ones are probed.
+        """
+        with self._lock:
+            mtimes = self._stat_dirs()
+            previous = self._games
+            games = dict(self.base_games)  # shallow copy
+            pending = set()
+
+            try:
+                for d in os.listdir(self.games_dir):
+                    folder_path = os.path.join(self.games_dir, d)
+                    if not os.path.isdir(folder_path):
+                        continue
+                    if not os.path.isfile(os.path.join(folder_path, "index.html")):
+                        pending.add(d)
+                        continue
+                    # Avoid overriding existing ids (e.g., BASE_GAMES)
+                    if d in games:
+                        continue
+                    old = previous.get(d)
+                    games[d] = self._folder_entry(d, old.get("preview") if old and old.get("folder") else None)
+            except FileNotFoundError:
+                # games directory may not exist; ignore
+                pass
+
+            # Legacy support: still include standalone html files in user_games (old uploads)
+            try:
+                for fname in (os.listdir(self.legacy_dir) if self.legacy_dir else ()):
+                    if not fname.lower().endswith(".html"):
+                        continue
+                    game_id = os.path.splitext(fname)[0]
+                    if game_id in games:
+                        continue
+                    games[game_id] = self._legacy_entry(game_id, fname)
+            except FileNotFoundError:
+                pass
+
+            self._games = games
+            self._pending = pending
+            self._dir_mtimes = mtimes
+            self._last_check = time.monotonic()
+            self.version += 1
+
+    def refresh(self, game_id: str):
+        """Re-probe a single game (and its preview) after an upload or removal touched it."""
+        with self._lock:
+            if game_id in self.base_games:
+                return
+            entry = None
+            folder_path = os.path.join(self.games_dir, game_id)
+            if os.path.isfile(os.path.join(folder_path, "index.html")):
+                entry = self._folder_entry(game_id)
+            elif self.legacy_dir:
+                fname = f"{game_id}.html"
+                if os.path.isfile(os.path.join(self.legacy_dir, fname)):
+                    entry = self._legacy_entry(game_id, fname)
+
+            games = dict(self._games)
+            if entry is None:
+                games.pop(game_id, None)
+            else:
+                games[game_id] = entry
+            self._pending.discard(game_id)
+            self._games = games
+            # The upload itself changed the directory mtime; don't rescan for it.
+            self._dir_mtimes = self._stat_dirs()
+            self.version += 1
+
+    def check_for_changes(self):
+        """Cheap watcher: rescan only if the directories changed since last look.
+
+        Throttled to one ``stat`` round per ``poll_interval`` seconds.
+        """
+        now = time.monotonic()
+        if now - self._last_check < self.poll_interval:
+            return
+        self._last_check = now
+
+        if self._stat_dirs() != self._dir_mtimes:
+            self.rebuild()
+            return
+        for game_id in list(self._pending):
+            if os.path.isfile(os.path.join(self.games_dir, game_id, "index.html")):
+                self.refresh(game_id)
+
+    # ---------------- lookups ----------------
+
+    def get(self, game_id: str) -> Optional[dict]:
+        self.check_for_changes()
+        return self._games.get(game_id)
+
+    def __contains__(self, game_id: str) -> bool:
+        return self.get(game_id) is not None
+
+    def snapshot(self) -> dict:
+        """Shallow copy of the whole index."""
+        self.check_for_changes()
+        return dict(self._games)
+
+
+class SortedIndex:
+    """Items ordered by a sortable key, kept sorted with ``bisect``.
+
+    Lookups and position queries are O(log n); updating a key moves one list
+    slot.  Ties are broken by item id so the order is deterministic.
+    """
+
+    def __init__(self):
+        self._keys: dict[str, Hashable] = {}
+        self._items: list[tuple] = []  # sorted (key, item_id)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._keys
+
+    def key_of(self, item_id: str):
+        return self._keys.get(item_id)
+
+    def update(self, item_id: str, key):
+        """Insert ``item_id`` or move it to its new key."""
+        if item_id in self._keys:
+            old = self._keys[item_id]
+            if old == key:
+                return
+            del self._items[bisect_left(self._items, (old, item_id))]
+        self._keys[item_id] = key
+        insort(self._items, (key, item_id))
+
+    def discard(self, item_id: str):
+        if item_id not in self._keys:
+            return
+        old = self._keys.pop(item_id)
+        del self._items[bisect_left(self._items, (old, item_id))]
+
+    def ids(self) -> list[str]:
+        return list(self._keys)
+
+    def keys(self):
+        """Live set-like view of the indexed ids (for set operations; do not hold on to it)."""
+        return self._keys.keys()
+
+    def position_after(self, key, item_id: str) -> int:
+        """Index of the first entry ordered after ``(key, item_id)`` (for cursors)."""
+        return bisect_right(self._items, (key, item_id))
+
+    def iter_from(self, position: int = 0) -> Iterator[str]:
+        """Item ids in key order starting at ``position``."""
+        for i in range(position, len(self._items)):
+            yield self._items[i][1]
+
+    def head(self, k: int, accept: Optional[Callable[[str], bool]] = None) -> list[str]:
+        """First ``k`` item ids in key order, optionally skipping rejected ones."""
+        if accept is None:
+            return [item_id for _, item_id in self._items[:k]]
+        result = []
+        for _, item_id in self._items:
+            if len(result) >= k:
+                break
+            if accept(item_id):
+                result.append(item_id)
+        return result
+
+
+class SearchIndex:
+    """Prefix + trigram index over a few short text fields per item.
+
+    Each field is indexed lower-cased, both whole and split into word tokens.
+    Prefix lookups bisect a sorted term list; substring lookups intersect the
+    posting sets of the query's trigrams and then verify the candidates.
+    """
+
+    _TOKEN_SPLIT = re.compile(r'[^0-9a-z\u4e00-\u9fff]+')
+
+    def __init__(self):
+        self._fields: dict[str, tuple] = {}
+        # item_id -> ("\0"-joined terms, "\0"-joined lower-cased fields): one
+        # substring test per item answers "any term starts with" / "any field contains"
+        self._blobs: dict[str, tuple[str, str]] = {}
+        self._terms: list[tuple[str, str]] = []  # sorted (term, item_id)
+        self._trigrams: dict[str, set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    @classmethod
+    def _terms_for(cls, fields: tuple) -> set[str]:
+        terms = set()
+        for value in fields:
+            value = (value or "").lower().strip()
+            if not value:
+                continue
+            terms.add(value)
+            terms.update(t for t in cls._TOKEN_SPLIT.split(value) if t)
+        return terms
+
+    @staticmethod
+    def _trigrams_of(text: str) -> set[str]:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def add(self, item_id: str, *fields: str):
+        """Index (or re-index) ``item_id``; a no-op if its fields did not change."""
+        fields = tuple(fields)
+        if self._fields.get(item_id) == fields:
+            return
+        self.remove(item_id)
+        self._fields[item_id] = fields
+        terms = self._terms_for(fields)
+        self._blobs[item_id] = ("".join("\0" + term for term in terms),
+                                "\0".join((value or "").lower() for value in fields))
+        for term in terms:
+            insort(self._terms, (term, item_id))
+            for tri in self._trigrams_of(term):
+                self._trigrams[tri].add(item_id)
+
+    def remove(self, item_id: str):
+        fields = self._fields.pop(item_id, None)
+        if fields is None:
+            return
+        del self._blobs[item_id]
+        for term in self._terms_for(fields):
+            i = bisect_left(self._terms, (term, item_id))
+            if i < len(self._terms) and self._terms[i] == (term, item_id):
+                del self._terms[i]
+            for tri in self._trigrams_of(term):
+                members = self._trigrams.get(tri)
+                if members is not None:
+                    members.discard(item_id)
+                    if not members:
+                        del self._trigrams[tri]
+
+    def matches(self, item_id: str, query: str) -> bool:
+        """Whether ``item_id`` matches ``query`` (lower-cased and stripped), same rule as :meth:`search`."""
+        blobs = self._blobs.get(item_id)
+        if blobs is None or not query or "\0" in query:
+            return False
+        return "\0" + query in blobs[0] or (len(query) >= 3 and query in blobs[1])
+
+    def _prefix_range(self, query: str) -> tuple[int, int]:
+        """Slice of ``_terms`` whose terms start with ``query``."""
+        lo = bisect_left(self._terms, (query, ""))
+        # every term in [query, query + U+10FFFF) starts with query; the loop
+        # only picks up terms that continue with U+10FFFF itself
+        hi = bisect_left(self._terms, (query + "\U0010ffff",), lo)
+        while hi < len(self._terms) and self._terms[hi][0].startswith(query):
+            hi += 1
+        return lo, hi
+
+    def _substring_candidates(self, query: str) -> set[str]:
+        """Ids holding every trigram of ``query`` (a superset of its substring matches)."""
+        if len(query) < 3:
+            return set()
+        postings = sorted((self._trigrams.get(tri, set()) for tri in self._trigrams_of(query)), key=len)
+        if not postings or not postings[0]:
+            return set()
+        return postings[0].intersection(*postings[1:])
+
+    def search(self, query: str) -> set[str]:
+        """Ids whose fields start with (any token) or contain ``query``."""
+        query = query.lower().strip()
+        if not query:
+            return set()
+
+        lo, hi = self._prefix_range(query)
+        matches = {item_id for _, item_id in self._terms[lo:hi]}
+        for item_id in self._substring_candidates(query) - matches:
+            if query in self._blobs[item_id][1]:
+                matches.add(item_id)
+        return matches
+
+    def top(self, query: str, k: int, order: "SortedIndex") -> tuple[list[str], bool]:
+        """First ``k`` matches of ``query`` in ``order``, plus whether more exist.
+
+        Items missing from ``order`` are skipped.  The match count is bounded
+        first (prefix range length plus trigram candidates).  A small match set
+        is collected and the ``k`` best picked; a large one is served by walking
+        ``order`` with :meth:`matches`, which finds ``k`` hits after about
+        ``k * len(order) / matches`` steps.  Both stay below
+        ``sqrt(k * len(order))`` item visits, so broad queries such as a single
+        letter no longer touch every match.
+        """
+        query = query.lower().strip()
+        if not query or k <= 0:
+            return [], False
+        budget = (k + 1) * len(order)
+
+        lo, hi = self._prefix_range(query)
+        estimate = hi - lo
+        candidates = set()
+        if estimate * estimate <= budget:
+            candidates = self._substring_candidates(query)
+            estimate += len(candidates)
+
+        if estimate * estimate <= budget:
+            found = {item_id for _, item_id in self._terms[lo:hi]}
+            found.update(item_id for item_id in candidates - found
+                         if query in self._blobs[item_id][1])
+            ranked = heapq.nsmallest(k + 1, (item_id for item_id in found if item_id in order),
+                                     key=lambda item_id: (order.key_of(item_id), item_id))
+        else:
+            ranked = order.head(k + 1, lambda item_id: self.matches(item_id, query))
+        return ranked[:k], len(ranked) > k
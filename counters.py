@@ -0,0 +1,39 @@
+"""In-process click counting that never blocks request handlers.
+
+Page views only append the game id to a deque (``deque.append`` and
+``deque.popleft`` are atomic in CPython, so producers need no lock).  A single
+background task drains the queue periodically and merges the counts into the
+catalog metadata.  Each worker process keeps its own counter and flushes its
+own deltas, so processes never share state either.
+"""
+from collections import Counter, deque
+
+__all__ = [
+    'ClickCounter',
+]
+
+
+class ClickCounter:
+    """Multi-producer / single-consumer click event sink."""
+
+    def __init__(self):
+        self._events: deque = deque()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def hit(self, game_id: str):
+        """Record one click; O(1) and lock-free."""
+        self._events.append(game_id)
+
+    def drain(self) -> Counter:
+        """Pop everything queued so far and return per-game counts.
+
+        Only the events present when the call starts are taken, so a steady
+        stream of clicks cannot keep the consumer looping forever.
+        """
+        counts = Counter()
+        pop = self._events.popleft
+        for _ in range(len(self._events)):
+            counts[pop()] += 1
+        return counts
@@ -0,0 +1,202 @@
+"""In-memory order-statistics leaderboards.
+
+``IndexableSkiplist`` is a sorted collection whose links also store how many
+elements they skip, so besides O(log n) insert/remove it answers "how many
+elements are smaller than x" (rank) and "which element is at position i"
+(select) in O(log n) expected time.  ``ScoreBoard`` keeps each player's best
+score of one (game, difficulty) board in such a list, highest score first.
+"""
+import random
+from typing import Iterator, Optional
+
+__all__ = [
+    'IndexableSkiplist',
+    'ScoreBoard',
+]
+
+
+class _Node:
+    __slots__ = ('value', 'next', 'width')
+
+    def __init__(self, value, level: int):
+        self.value = value
+        self.next: list = [None] * level
+        # width[i]: number of bottom-level steps from this node to next[i]
+        self.width: list = [1] * level
+
+
+class IndexableSkiplist:
+    """Sorted multiset with O(log n) insert, remove, rank and index access."""
+
+    MAX_LEVEL = 24  # plenty for 2**24 elements
+
+    def __init__(self):
+        self._size = 0
+        self._head = _Node(None, self.MAX_LEVEL)
+        self._tail = _Node(None, self.MAX_LEVEL)  # sentinel ordered after everything
+        self._head.next = [self._tail] * self.MAX_LEVEL
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator:
+        return self.iter_from(0)
+
+    @classmethod
+    def _random_level(cls) -> int:
+        level = 1
+        while level < cls.MAX_LEVEL and random.random() < 0.5:
+            level += 1
+        return level
+
+    def _find_before(self, value):
+        """Last node < ``value`` per level and the position of each (head is 0)."""
+        chain = [None] * self.MAX_LEVEL
+        positions = [0] * self.MAX_LEVEL
+        node, pos, tail = self._head, 0, self._tail
+        for level in range(self.MAX_LEVEL - 1, -1, -1):
+            nxt = node.next[level]
+            while nxt is not tail and nxt.value < value:
+                pos += node.width[level]
+                node = nxt
+                nxt = node.next[level]
+            chain[level] = node
+            positions[level] = pos
+        return chain, positions
+
+    def insert(self, value):
+        chain, positions = self._find_before(value)
+        new_pos = positions[0] + 1
+        level = self._random_level()
+        node = _Node(value, level)
+        for i in range(level):
+            prev = chain[i]
+            node.next[i] = prev.next[i]
+            prev.next[i] = node
+            node.width[i] = prev.width[i] - (new_pos - positions[i]) + 1
+            prev.width[i] = new_pos - positions[i]
+        for i in range(level, self.MAX_LEVEL):
+            chain[i].width[i] += 1
+        self._size += 1
+
+    def remove(self, value):
+        """Remove one occurrence of ``value``; ValueError if absent."""
+        chain, _ = self._find_before(value)
+        target = chain[0].next[0]
+        if target is self._tail or target.value != value:
+            raise ValueError(f"{value!r} not in skiplist")
+        for i in range(self.MAX_LEVEL):
+            prev = chain[i]
+            if prev.next[i] is target:
+                prev.width[i] += target.width[i] - 1
+                prev.next[i] = target.next[i]
+            else:
+                prev.width[i] -= 1
+        self._size -= 1
+
+    def count_less(self, value) -> int:
+        """Number of elements strictly smaller than ``value`` (like ``bisect_left``)."""
+        node, pos, tail = self._head, 0, self._tail
+        for level in range(self.MAX_LEVEL - 1, -1, -1):
+            nxt = node.next[level]
+            while nxt is not tail and nxt.value < value:
+                pos += node.width[level]
+                node = nxt
+                nxt = node.next[level]
+        return pos
+
+    def _node_at(self, index: int) -> _Node:
+        target = index + 1
+        node, pos = self._head, 0
+        for level in range(self.MAX_LEVEL - 1, -1, -1):
+            while pos + node.width[level] <= target:
+                pos += node.width[level]
+                node = node.next[level]
+        return node
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("skiplist index out of range")
+        return self._node_at(index).value
+
+    def iter_from(self, index: int) -> Iterator:
+        """Elements in order starting at position ``index``."""
+        if index >= self._size:
+            return
+        node = self._node_at(max(index, 0))
+        tail = self._tail
+        while node is not tail:
+            yield node.value
+            node = node.next[0]
+
+
+class ScoreBoard:
+    """Best score per player on one board, ordered highest first (ties by name).
+
+    Not thread-safe; callers guard it with their own lock.
+    """
+
+    def __init__(self):
+        self._scores: dict[str, int] = {}
+        self._order = IndexableSkiplist()  # (-score, player)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, player: str) -> bool:
+        return player in self._scores
+
+    def get(self, player: str) -> Optional[int]:
+        return self._scores.get(player)
+
+    def set(self, player: str, score: int):
+        """Store ``score`` for ``player`` unconditionally."""
+        old = self._scores.get(player)
+        if old == score:
+            return
+        if old is not None:
+            self._order.remove((-old, player))
+        self._scores[player] = score
+        self._order.insert((-score, player))
+
+    def submit(self, player: str, score: int) -> bool:
+        """Keep the better of the stored and the new score; True if it changed."""
+        old = self._scores.get(player)
+        if old is not None and score <= old:
+            return False
+        self.set(player, score)
+        return True
+
+    def discard(self, player: str):
+        old = self._scores.pop(player, None)
+        if old is not None:
+            self._order.remove((-old, player))
+
+    def position(self, player: str) -> Optional[int]:
+        """0-based position of ``player`` in board order, or None if absent."""
+        score = self._scores.get(player)
+        if score is None:
+            return None
+        return self._order.count_less((-score, player))
+
+    def count_above(self, score: int) -> int:
+        """Number of players with a strictly higher score."""
+        return self._order.count_less((-score,))
+
+    def rank_of(self, score: int) -> int:
+        """1-based rank a score of ``score`` has on this board."""
+        return self.count_above(score) + 1
+
+    def entries(self, start: int = 0, stop: Optional[int] = None) -> list[tuple[str, int]]:
+        """``(player, score)`` pairs at positions ``start`` to ``stop`` (exclusive)."""
+        result = []
+        for neg_score, player in self._order.iter_from(start):
+            if stop is not None and start + len(result) >= stop:
+                break
+            result.append((player, -neg_score))
+        return result
+
+    def top(self, k: int) -> list[tuple[str, int]]:
+        return self.entries(0, k)
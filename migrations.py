@@ -0,0 +1,97 @@
+"""Versioned schema migrations.
+
+``db.create_all()`` only creates missing tables; it never changes a table
+that already exists.  Changes to existing tables are listed in
+``MIGRATIONS`` as ``(version, description, upgrade)`` and applied in order
+by :func:`run_migrations`, which records each applied version in
+``schema_migrations``.  Upgrades receive a connection inside a transaction
+and must be idempotent, because a fresh database already gets the current
+schema from ``create_all()`` (and MySQL commits DDL implicitly anyway).
+
+To add a migration, append the next version number; never edit or reorder
+one that has shipped.
+"""
+import logging
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from extensions import db
+from models import Score, SchemaMigration
+
+__all__ = [
+    'MIGRATIONS',
+    'run_migrations',
+]
+
+logger = logging.getLogger('gameplatform')
+
+
+def _create_index_if_missing(conn, index: db.Index):
+    existing = {ix['name'] for ix in inspect(conn).get_indexes(index.table.name)}
+    if index.name not in existing:
+        index.create(conn)
+
+
+def _add_scores_board_index(conn):
+    """(game_id, difficulty, score DESC, player_name) on scores."""
+    index = next(ix for ix in Score.__table__.indexes if ix.name == 'ix_scores_board')
+    _create_index_if_missing(conn, index)
+
+
+MIGRATIONS = [
+    (1, "scores: composite (game_id, difficulty, score DESC, player_name) index", _add_scores_board_index),
+]
+
+
+def _is_recorded(engine, version: int) -> bool:
+    with engine.connect() as conn:
+        return conn.execute(db.select(SchemaMigration.version)
+                            .where(SchemaMigration.version == version)).first() is not None
+
+
+def _apply(engine, version: int, description: str, upgrade) -> bool:
+    """Run one migration; False if another worker applied it concurrently.
+
+    Two workers starting together can race on the same upgrade.  The loser
+    either fails to record the version (``IntegrityError``) or, on MySQL where
+    DDL commits implicitly, fails the DDL itself (``OperationalError``, e.g.
+    1061 duplicate key name).  In the latter case the winner may not have
+    recorded the version yet, so the idempotent upgrade is retried once.
+    """
+    for attempt in range(2):
+        try:
+            with engine.begin() as conn:
+                upgrade(conn)
+                conn.execute(db.insert(SchemaMigration).values(version=version, description=description))
+            return True
+        except IntegrityError:
+            return False
+        except OperationalError:
+            if _is_recorded(engine, version):
+                return False
+            if attempt:
+                raise
+            logger.warning('Schema migration %d failed, retrying once', version, exc_info=True)
+    return False
+
+
+def run_migrations(engine=None) -> list[int]:
+    """Apply every migration not yet recorded; returns the versions applied now.
+
+    Must run after ``db.create_all()`` (which creates ``schema_migrations``).
+    """
+    engine = engine or db.engine
+    with engine.connect() as conn:
+        applied = {v for (v,) in conn.execute(db.select(SchemaMigration.version))}
+
+    done = []
+    for version, description, upgrade in MIGRATIONS:
+        if version in applied:
+            continue
+        if not _apply(engine, version, description, upgrade):
+            # another worker applied it concurrently
+            continue
+        logger.info('Applied schema migration %d: %s', version, description)
+        done.append(version)
+    return done
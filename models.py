@@ -6,6 +6,10 @@ __all__ = [
     'GameConfigModel',
     'UserName',
     'IPBlacklist',
+    'GameClickHourly',
+    'GameVisitorSketch',
+    'SchemaMigration',
+    'WindowScore',
 ]
 
 
@@ -21,6 +25,8 @@ class Score(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint('game_id', 'difficulty', 'player_name', name='uniq_game_diff_player'),
+        # Covers "top N of a board" and "how many scored higher" without a filesort (migration 1)
+        db.Index('ix_scores_board', game_id, difficulty, score.desc(), player_name),
     )
 
 
@@ -50,4 +56,51 @@ class IPBlacklist(db.Model):
     __tablename__ = 'ip_blacklist'
 
     ip = db.Column(db.String(45), primary_key=True)
-    timestamp = db.Column(db.String(32), default=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S")) 
\ No newline at end of file
+    timestamp = db.Column(db.String(32), default=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S")) 
+
+
+class GameClickHourly(db.Model):
+    """Clicks per game per hour (rollup feeding the trending ranking)."""
+    __tablename__ = 'game_click_hourly'
+
+    game_id = db.Column(db.String(64), primary_key=True)
+    hour = db.Column(db.Integer, primary_key=True, index=True)  # epoch seconds // 3600
+    clicks = db.Column(db.Integer, nullable=False, default=0)
+
+
+class GameVisitorSketch(db.Model):
+    """HyperLogLog registers estimating distinct visitors per game and period."""
+    __tablename__ = 'game_visitor_sketches'
+
+    game_id = db.Column(db.String(64), primary_key=True)
+    period = db.Column(db.String(10), primary_key=True)  # 'YYYY-MM-DD' or 'all'
+    registers = db.Column(db.LargeBinary, nullable=False)
+
+
+class SchemaMigration(db.Model):
+    """Applied schema migrations (see migrations.py)."""
+    __tablename__ = 'schema_migrations'
+
+    version = db.Column(db.Integer, primary_key=True)
+    description = db.Column(db.String(255), nullable=False)
+    applied_at = db.Column(db.String(32), default=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+
+class WindowScore(db.Model):
+    """Best score per player in the current day / week.
+
+    One row per player and window kind; a submission in a new period simply
+    overwrites the row, so expired periods never need a DELETE.
+    """
+    __tablename__ = 'window_scores'
+
+    kind = db.Column(db.String(8), primary_key=True)  # 'daily' / 'weekly'
+    game_id = db.Column(db.String(64), primary_key=True)
+    difficulty = db.Column(db.String(16), primary_key=True)
+    player_name = db.Column(db.String(64), primary_key=True)
+    period = db.Column(db.String(10), nullable=False)  # '2026-10-16' / '2026-W42'
+    score = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_window_scores_period', kind, period),
+    )
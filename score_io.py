@@ -0,0 +1,281 @@
+"""
+排行榜成绩导入 / 导出工具（流式，内存占用与数据量无关）
+
+    python score_io.py export scores.ndjson            # 导出为 NDJSON（每行一条）
+    python score_io.py export scores.json --format json
+    python score_io.py export - | gzip > scores.ndjson.gz
+    python score_io.py import scores.ndjson
+    python score_io.py import scores.json              # 也支持旧版 scores.json 的各种结构
+
+每条记录为 {"game", "difficulty", "name", "score"}。导出用 yield_per 分块读取；
+导入按块做多行 upsert，同一玩家只保留最高分（与线上提交规则一致），可重复执行。
+app.py 启动时不再自动迁移 scores.json，请用本脚本导入。
+
+注意：app.py 的各个 worker 只在启动时从 scores 表加载内存排行榜（以及"有排行榜的游戏"
+集合），之后只跟踪经由 /api 提交的成绩。对运行中的服务导入后，导入的记录要等 worker
+重启后才会出现在排行榜、排名和直方图里。
+"""
+import argparse
+import json
+import logging
+import sys
+from typing import Iterator, TextIO
+
+from flask import Flask
+
+from extensions import db, DATABASE_URI
+from models import Score
+from score_store import prepare_score_submission, write_best_scores
+
+# 旧版 scores.json 里没有游戏 / 玩家信息时使用的默认值（与旧的 load_scores 一致）
+LEGACY_GAME_ID = 'ball'
+LEGACY_PLAYER_NAME = 'Unknown'
+# 数字之后合法出现的字符；其余字符说明数字可能还没读完
+NUMBER_DELIMITERS = frozenset(' \t\r\n,]}')
+
+logger = logging.getLogger(__name__)
+
+
+def create_app(database_uri: str) -> Flask:
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+# ---------------- 流式 JSON 读取 ----------------
+
+class JsonStream:
+    """逐个解析 JSON 值的读取器：只缓存当前正在解析的那一个值。"""
+
+    def __init__(self, fp: TextIO, chunk_size: int = 1 << 16):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        data = self.fp.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """跳过空白并返回下一个字符（文件结束返回空串）。"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """解析下一个完整的 JSON 值。"""
+        self.peek()
+        while True:
+            try:
+                result, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # 数字可能被块边界截断（"12|3"、"-0|.5"、"1|e9"），后面不是分隔符时再多读一块确认
+            if (isinstance(result, (int, float)) and not isinstance(result, bool)
+                    and (end == len(self.buf) or self.buf[end] not in NUMBER_DELIMITERS)
+                    and self._fill()):
+                continue
+            self.pos = end
+            return result
+
+    def items(self) -> Iterator:
+        """逐个产出数组元素（当前位置必须是 '['）。"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+    def members(self) -> Iterator[str]:
+        """逐个产出对象的键，调用方接着读取对应的值（当前位置必须是 '{'）。"""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+
+def _bucket_records(game_id: str, difficulty: str, items: Iterator) -> Iterator[dict]:
+    for item in items:
+        if isinstance(item, dict):
+            yield {"game": game_id, "difficulty": difficulty,
+                   "name": item.get("name", LEGACY_PLAYER_NAME), "score": item.get("score", 0)}
+        else:
+            yield {"game": game_id, "difficulty": difficulty, "name": LEGACY_PLAYER_NAME, "score": item}
+
+
+def read_json_records(fp: TextIO) -> Iterator[dict]:
+    """
+    流式读取 JSON 文件中的成绩，兼容：
+      - 本工具导出的记录数组 [{"game", "difficulty", "name", "score"}, ...]
+      - 最旧的结构：分数数组 [12, 34, ...]（记为 ball / medium）
+      - {game: {difficulty: [{name, score} 或 分数, ...]}}
+      - {difficulty: [...]}（记为 ball）
+    """
+    stream = JsonStream(fp)
+    first = stream.peek()
+    if first == "[":
+        for item in stream.items():
+            if isinstance(item, dict) and "game" in item:
+                yield item
+            else:
+                yield from _bucket_records(LEGACY_GAME_ID, "medium", [item])
+    elif first == "{":
+        for key in stream.members():
+            if stream.peek() == "{":
+                for difficulty in stream.members():
+                    if stream.peek() == "[":
+                        yield from _bucket_records(key, difficulty, stream.items())
+                    else:
+                        stream.value()  # 不认识的结构，跳过
+            elif stream.peek() == "[":
+                yield from _bucket_records(LEGACY_GAME_ID, key, stream.items())
+            else:
+                stream.value()
+    elif first:
+        raise ValueError("unsupported JSON layout: expected an array or an object")
+
+
+def read_ndjson_records(fp: TextIO) -> Iterator[dict]:
+    for line_no, line in enumerate(fp, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"line {line_no}: {exc}") from exc
+
+
+# ---------------- 导入 ----------------
+
+def normalize_record(record: dict):
+    """把一条记录交给 prepare_score_submission 校验（与线上提交规则相同）；无效记录返回 None。"""
+    game_id = str(record.get("game") or record.get("gameId") or "").strip()
+    difficulty = str(record.get("difficulty", "medium")).lower()
+    name = str(record.get("name") or record.get("playerName") or "").strip()
+    entry, _ = prepare_score_submission(game_id, difficulty, name, record.get("score", 0))
+    return entry
+
+
+def import_scores(fp: TextIO, fmt: str, chunk_size: int) -> tuple[int, int]:
+    """按块写入（每块一条多行 upsert、一个事务），返回 (导入的记录数, 跳过的无效记录数)。"""
+    records = read_ndjson_records(fp) if fmt == "ndjson" else read_json_records(fp)
+    chunk = []
+    imported = skipped = 0
+    for record in records:
+        entry = normalize_record(record) if isinstance(record, dict) else None
+        if entry is None:
+            skipped += 1
+            continue
+        chunk.append(entry)
+        if len(chunk) >= chunk_size:
+            write_best_scores(chunk)
+            db.session.commit()
+            imported += len(chunk)
+            chunk.clear()
+            logger.info("imported %d records", imported)
+    if chunk:
+        write_best_scores(chunk)
+        db.session.commit()
+        imported += len(chunk)
+    return imported, skipped
+
+
+# ---------------- 导出 ----------------
+
+def export_scores(out: TextIO, fmt: str, chunk_size: int) -> int:
+    """按 yield_per 分块流式导出，返回导出的记录数。"""
+    rows = (db.session.query(Score.game_id, Score.difficulty, Score.player_name, Score.score)
+            .order_by(Score.game_id, Score.difficulty, Score.score.desc())
+            .execution_options(stream_results=True)
+            .yield_per(chunk_size))
+    count = 0
+    if fmt == "json":
+        out.write("[")
+    for game_id, difficulty, name, score in rows:
+        line = json.dumps({"game": game_id, "difficulty": difficulty, "name": name, "score": score},
+                          ensure_ascii=False)
+        if fmt == "json":
+            out.write(("\n" if count == 0 else ",\n") + line)
+        else:
+            out.write(line + "\n")
+        count += 1
+    if fmt == "json":
+        out.write("\n]\n")
+    return count
+
+
+def guess_format(path: str) -> str:
+    return "json" if path.lower().endswith(".json") else "ndjson"
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="排行榜成绩流式导入 / 导出")
+    parser.add_argument("command", choices=("import", "export"))
+    parser.add_argument("path", help="文件路径，'-' 表示标准输入 / 输出")
+    parser.add_argument("--format", choices=("json", "ndjson"), help="默认按扩展名判断（.json 为 JSON，其余为 NDJSON）")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--database-uri", default=DATABASE_URI)
+    args = parser.parse_args()
+
+    fmt = args.format or guess_format(args.path)
+    app = create_app(args.database_uri)
+    with app.app_context():
+        db.create_all()
+        if args.command == "export":
+            if args.path == "-":
+                count = export_scores(sys.stdout, fmt, args.chunk_size)
+            else:
+                with open(args.path, "w", encoding="utf-8") as out:
+                    count = export_scores(out, fmt, args.chunk_size)
+            logger.info("exported %d rows", count)
+        else:
+            if args.path == "-":
+                written, skipped = import_scores(sys.stdin, fmt, args.chunk_size)
+            else:
+                with open(args.path, "r", encoding="utf-8") as fp:
+                    written, skipped = import_scores(fp, fmt, args.chunk_size)
+            logger.info("imported %d records, skipped %d invalid ones", written, skipped)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""Score validation and database writes shared by the app and the offline tools.
+
+``app.py``, ``score_io.py`` and the benchmarks all go through these helpers, so
+the rules for what a valid score is and how a player's best score is stored
+live in one place.  Importing this module has no side effects; the write
+helpers need an application context and leave committing to the caller.
+"""
+from sqlalchemy.dialects import mysql as mysql_dialect, sqlite as sqlite_dialect
+
+from extensions import db
+from models import Score, WindowScore
+
+__all__ = [
+    'LEADERBOARD_DIFFICULTIES',
+    'GAME_ID_MAX_LENGTH',
+    'SCORE_MIN',
+    'SCORE_MAX',
+    'prepare_score_submission',
+    'upsert_statement',
+    'window_scores_upsert',
+    'write_best_scores',
+]
+
+LEADERBOARD_DIFFICULTIES = ("easy", "medium", "hard")
+# scores.game_id / window_scores.game_id are VARCHAR(64)
+GAME_ID_MAX_LENGTH = 64
+# scores.score is a 32-bit INTEGER; the database rejects anything outside it
+SCORE_MIN = -2 ** 31
+SCORE_MAX = 2 ** 31 - 1
+
+
+def prepare_score_submission(game_id: str, difficulty: str, player_name: str, score):
+    """
+    校验并规范化一条成绩
+
+    Returns:
+        tuple: ((game_id, difficulty, player_name, score), None) 或 (None, 错误信息)
+    """
+    if not game_id:
+        return None, "missing game id"
+
+    if len(game_id) > GAME_ID_MAX_LENGTH:
+        return None, "game id too long"
+
+    if difficulty not in LEADERBOARD_DIFFICULTIES:
+        difficulty = "medium"
+
+    if not player_name:
+        player_name = "匿名玩家"
+
+    player_name = player_name[:32]  # 限制长度
+
+    try:
+        score = int(score)
+    except (TypeError, ValueError, OverflowError):
+        return None, "invalid score"
+
+    if not SCORE_MIN <= score <= SCORE_MAX:
+        return None, "score out of range"
+
+    return (game_id, difficulty, player_name, score), None
+
+
+def upsert_statement(table, values: dict, key_columns: list, update_builder, dialect: str = None):
+    """INSERT ... ON DUPLICATE KEY UPDATE (MySQL) / ON CONFLICT DO UPDATE (SQLite).
+
+    ``values`` is one row dict, or a list of them for a multi-row insert.
+    ``update_builder(inserted)`` returns the column -> expression mapping for the
+    update branch; ``inserted`` refers to the row that failed to insert.  Return a
+    list of ``(column, expression)`` pairs when the order matters: MySQL applies
+    the assignments left to right, each seeing the columns already updated, and
+    emits a dict in table-column order.  ``dialect`` defaults to the bound engine's.
+    Returns None for dialects without native upsert support.
+    """
+    dialect = dialect or db.engine.dialect.name
+    if dialect == 'mysql':
+        stmt = mysql_dialect.insert(table).values(values)
+        updates = update_builder(stmt.inserted)
+        if isinstance(updates, dict):
+            return stmt.on_duplicate_key_update(**updates)
+        return stmt.on_duplicate_key_update(list(updates))
+    if dialect == 'sqlite':
+        stmt = sqlite_dialect.insert(table).values(values)
+        # SQLite evaluates every SET expression against the old row, so order is irrelevant
+        return stmt.on_conflict_do_update(index_elements=key_columns, set_=dict(update_builder(stmt.excluded)))
+    return None
+
+
+def window_scores_upsert(rows: list, dialect: str = None):
+    """Upsert of ``window_scores`` rows: keep the best score within a period, overwrite on a new one.
+
+    ``score`` is assigned before ``period``; MySQL would otherwise compare against
+    the already-updated period and carry the previous period's best over.
+    Returns None for dialects without native upsert support.
+    """
+    dialect = dialect or db.engine.dialect.name
+    table = WindowScore.__table__
+    best_of = db.func.greatest if dialect == 'mysql' else db.func.max  # SQLite: scalar max()
+    return upsert_statement(table, rows, ['kind', 'game_id', 'difficulty', 'player_name'],
+                            lambda inserted: [
+                                ("score", db.case((table.c.period == inserted.period,
+                                                   best_of(table.c.score, inserted.score)),
+                                                  else_=inserted.score)),
+                                ("period", inserted.period),
+                            ], dialect=dialect)
+
+
+def write_best_scores(entries: list):
+    """Store each ``(game_id, difficulty, player_name, score)`` unless the player already has a better one.
+
+    One multi-row INSERT ... ON DUPLICATE KEY UPDATE score = GREATEST(score, VALUES(score))
+    on MySQL, ON CONFLICT ... DO UPDATE SET score = max(score, excluded.score) on SQLite.
+    The caller commits.
+    """
+    best: dict[tuple, int] = {}
+    for game_id, difficulty, player_name, score in entries:
+        key = (game_id, difficulty, player_name)
+        if key not in best or score > best[key]:
+            best[key] = score
+    if not best:
+        return
+    rows = [{"game_id": g, "difficulty": d, "player_name": p, "score": v} for (g, d, p), v in best.items()]
+
+    table = Score.__table__
+    best_of = db.func.greatest if db.engine.dialect.name == 'mysql' else db.func.max  # SQLite: scalar max()
+    stmt = upsert_statement(table, rows, ['game_id', 'difficulty', 'player_name'],
+                            lambda inserted: {"score": best_of(table.c.score, inserted.score)})
+    if stmt is not None:
+        db.session.execute(stmt)
+        return
+    # generic fallback
+    for values in rows:
+        row = Score.query.filter_by(game_id=values["game_id"], difficulty=values["difficulty"],
+                                    player_name=values["player_name"]).first()
+        if row is None:
+            db.session.add(Score(**values))
+        elif values["score"] > row.score:
+            row.score = values["score"]
@@ -0,0 +1,231 @@
+"""Probabilistic sketches.
+
+``HyperLogLog`` estimates the number of distinct values it has seen using a
+fixed ``2 ** precision`` bytes of registers, independent of the number of
+values (2 KB and about 2.3% standard error at the default precision 11).
+Sketches merge by taking the register-wise maximum, so copies built by
+different processes or loaded from the DB can be combined without loss.
+
+``ScoreHistogram`` counts integer scores in a fixed set of log-scale bins
+(exact for small scores, about 5% relative width above ~20).  Prefix sums
+live in a Fenwick tree, so "how many are below x" and quantiles cost
+O(log bins), independent of the number of scores.  Histograms merge by adding counts.
+"""
+import hashlib
+import math
+import zlib
+from array import array
+
+__all__ = [
+    'HyperLogLog',
+    'ScoreHistogram',
+]
+
+
+class HyperLogLog:
+    """Distinct-count sketch (HyperLogLog with linear counting for small ranges)."""
+
+    def __init__(self, precision: int = 11, registers: bytes = None):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.m = 1 << precision
+        if registers is not None and len(registers) != self.m:
+            raise ValueError(f"expected {self.m} registers, got {len(registers)}")
+        self._registers = bytearray(registers) if registers is not None else bytearray(self.m)
+        self._estimate = None  # cached until the next change
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+    def add(self, value: str) -> bool:
+        """Add one value; True if a register changed."""
+        h = self._hash(value)
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+            self._estimate = None
+            return True
+        return False
+
+    def merge(self, other: 'HyperLogLog') -> bool:
+        """Fold ``other`` into this sketch; True if anything changed."""
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precision")
+        changed = False
+        registers = self._registers
+        for i, r in enumerate(other._registers):
+            if r > registers[i]:
+                registers[i] = r
+                changed = True
+        if changed:
+            self._estimate = None
+        return changed
+
+    def estimate(self) -> int:
+        """Approximate number of distinct values added."""
+        if self._estimate is None:
+            m = self.m
+            alpha = 0.7213 / (1 + 1.079 / m)
+            raw = alpha * m * m / sum(2.0 ** -r for r in self._registers)
+            zeros = self._registers.count(0)
+            if raw <= 2.5 * m and zeros:
+                raw = m * math.log(m / zeros)
+            self._estimate = int(round(raw))
+        return self._estimate
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'HyperLogLog':
+        return cls(precision=len(data).bit_length() - 1, registers=data)
+
+
+class ScoreHistogram:
+    """Counts of signed integer scores in fixed log-scale bins.
+
+    Bin ``per_side`` holds 0; positive magnitude ``m`` covers
+    ``(gamma ** (m - 1), gamma ** m]`` and negative scores mirror it.
+    Magnitudes beyond ``max_value`` land in the outermost bins.
+    """
+
+    def __init__(self, gamma: float = 1.05, max_value: int = 2 ** 31):
+        self.gamma = gamma
+        self.max_value = max_value
+        self._log_gamma = math.log(gamma)
+        self.per_side = math.ceil(math.log(max_value) / self._log_gamma) + 1
+        self.size = 2 * self.per_side + 1
+        self._counts = [0] * self.size
+        self._tree = [0] * (self.size + 1)  # Fenwick tree over _counts
+        self.total = 0
+
+    def __len__(self) -> int:
+        return self.total
+
+    # ---------------- bins ----------------
+
+    def _magnitude(self, value: int) -> int:
+        """Bin distance from zero of a positive magnitude."""
+        return min(max(math.ceil(math.log(value) / self._log_gamma), 0), self.per_side - 1)
+
+    def bin_of(self, value: int) -> int:
+        if value == 0:
+            return self.per_side
+        magnitude = self._magnitude(abs(value))
+        return self.per_side + 1 + magnitude if value > 0 else self.per_side - 1 - magnitude
+
+    def _highest(self, magnitude: int) -> int:
+        """Largest positive integer whose magnitude is ``<= magnitude`` (0 if none)."""
+        if magnitude >= self.per_side - 1:
+            return self.max_value  # the outermost bin also takes everything beyond
+        high = math.floor(self.gamma ** magnitude)
+        while self._magnitude(high + 1) <= magnitude:
+            high += 1
+        while high > 0 and self._magnitude(high) > magnitude:
+            high -= 1
+        return high
+
+    def bounds(self, index: int) -> tuple[int, int]:
+        """Smallest and largest integer score of bin ``index`` (low > high if it holds none)."""
+        if index == self.per_side:
+            return 0, 0
+        magnitude = abs(index - self.per_side) - 1
+        high = self._highest(magnitude)
+        low = self._highest(magnitude - 1) + 1 if magnitude > 0 else 1
+        return (low, high) if index > self.per_side else (-high, -low)
+
+    # ---------------- updates ----------------
+
+    def _bump(self, index: int, delta: int):
+        self._counts[index] += delta
+        self.total += delta
+        i = index + 1
+        while i <= self.size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def add(self, value: int, count: int = 1):
+        self._bump(self.bin_of(value), count)
+
+    def remove(self, value: int, count: int = 1):
+        index = self.bin_of(value)
+        if self._counts[index] < count:
+            raise ValueError(f"{value!r} not in histogram")
+        self._bump(index, -count)
+
+    def merge(self, other: 'ScoreHistogram'):
+        if other.size != self.size or other.gamma != self.gamma:
+            raise ValueError("cannot merge histograms with different bins")
+        for index, count in enumerate(other._counts):
+            if count:
+                self._bump(index, count)
+
+    # ---------------- queries ----------------
+
+    def _prefix(self, index: int) -> int:
+        """Number of scores in bins ``< index``."""
+        total, i = 0, index
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def count_below(self, value: int) -> int:
+        """Scores in bins strictly below the bin of ``value``."""
+        return self._prefix(self.bin_of(value))
+
+    def percent_below(self, value: int) -> float:
+        """Share of scores (in %) that ``value`` beats."""
+        return round(self.count_below(value) / self.total * 100, 2) if self.total else 0.0
+
+    def quantile(self, q: float) -> int:
+        """Upper bound of the bin holding the ``q``-quantile (0 <= q <= 1)."""
+        if not self.total:
+            return 0
+        target = min(max(math.ceil(q * self.total), 1), self.total)
+        # Fenwick descent: largest position whose prefix sum is < target
+        pos, step = 0, 1 << self.size.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and self._tree[nxt] < target:
+                pos = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        return self.bounds(pos)[1]
+
+    def buckets(self, max_buckets: int) -> list[dict]:
+        """Non-empty range coalesced into at most ``max_buckets`` ``{min, max, count}`` groups."""
+        used = [i for i, c in enumerate(self._counts) if c]
+        if not used or max_buckets < 1:
+            return []
+        first, last = used[0], used[-1]
+        width = max(1, math.ceil((last - first + 1) / max_buckets))
+        result = []
+        for start in range(first, last + 1, width):
+            stop = min(start + width, last + 1)
+            low, high = self.bounds(start)[0], self.bounds(stop - 1)[1]
+            if low > high:
+                continue  # only bins that cannot hold an integer
+            result.append({"min": low, "max": high, "count": sum(self._counts[start:stop])})
+        return result
+
+    # ---------------- persistence ----------------
+
+    def to_bytes(self) -> bytes:
+        return zlib.compress(array('q', self._counts).tobytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes, gamma: float = 1.05, max_value: int = 2 ** 31) -> 'ScoreHistogram':
+        histogram = cls(gamma=gamma, max_value=max_value)
+        counts = array('q')
+        counts.frombytes(zlib.decompress(data))
+        if len(counts) != histogram.size:
+            raise ValueError(f"expected {histogram.size} bins, got {len(counts)}")
+        for index, count in enumerate(counts):
+            if count:
+                histogram._bump(index, count)
+        return histogram
@@ -0,0 +1,90 @@
+import random
+import re
+
+from catalog import SearchIndex, SortedIndex
+
+ALPHABET = "abg_- 1匿名游"
+
+
+def reference_match(fields, query):
+    """Brute force: a field or one of its word tokens starts with the query, or (3+ chars) a field contains it."""
+    query = query.lower().strip()
+    if not query:
+        return False
+    for value in fields:
+        value = (value or "").lower()
+        if len(query) >= 3 and query in value:
+            return True
+        stripped = value.strip()
+        tokens = [stripped] + re.split(r'[^0-9a-z一-鿿]+', stripped)
+        if any(token and token.startswith(query) for token in tokens):
+            return True
+    return False
+
+
+def random_text(rng, max_len=8):
+    return "".join(rng.choice(ALPHABET + "AB") for _ in range(rng.randrange(max_len)))
+
+
+def test_search_index_matches_brute_force():
+    rng = random.Random(5)
+    index, order, items = SearchIndex(), SortedIndex(), {}
+    for step in range(1500):
+        item_id = f"i{rng.randrange(300)}"
+        if item_id in items and rng.random() < 0.3:
+            index.remove(item_id)
+            order.discard(item_id)
+            del items[item_id]
+        else:
+            fields = (item_id, random_text(rng), rng.choice(["匿名", "Bob", "", None]))
+            index.add(item_id, *fields)
+            order.update(item_id, (rng.randrange(20),))
+            items[item_id] = fields
+        if step % 25:
+            continue
+
+        assert len(index) == len(items)
+        for query in [random_text(rng, 5) for _ in range(10)] + ["g", "匿", "abg"]:
+            expected = {i for i, fields in items.items() if reference_match(fields, query)}
+            assert index.search(query) == expected, query
+            probe = rng.choice(list(items)) if items else "missing"
+            assert index.matches(probe, query.lower().strip()) == (probe in expected)
+
+            ranked = sorted(expected, key=lambda i: (order.key_of(i), i))
+            for k in (1, 3, 20, 400):
+                assert index.top(query, k, order) == (ranked[:k], len(ranked) > k), (query, k)
+
+
+def test_search_index_top_skips_items_outside_the_order():
+    index, order = SearchIndex(), SortedIndex()
+    index.add("a1", "a1")
+    index.add("a2", "a2")
+    order.update("a2", (0,))
+    assert index.top("a", 5, order) == (["a2"], False)
+    assert index.top("  ", 5, order) == ([], False)
+
+
+def test_sorted_index_matches_sorted_list():
+    rng = random.Random(6)
+    index, keys = SortedIndex(), {}
+    for _ in range(3000):
+        item_id = f"i{rng.randrange(200)}"
+        if item_id in keys and rng.random() < 0.3:
+            index.discard(item_id)
+            del keys[item_id]
+        else:
+            keys[item_id] = (rng.randrange(30),)
+            index.update(item_id, keys[item_id])
+        index.discard("missing")
+
+        expected = sorted((key, i) for i, key in keys.items())
+        assert len(index) == len(expected)
+        assert set(index.keys()) == set(keys)
+        if expected:
+            key, item_id = rng.choice(expected)
+            position = index.position_after(key, item_id)
+            assert list(index.iter_from(position)) == [i for k, i in expected if (k, i) > (key, item_id)]
+            assert index.key_of(item_id) == key
+        accept = {i for i in keys if rng.random() < 0.5}
+        assert index.head(7) == [i for _, i in expected[:7]]
+        assert index.head(7, accept.__contains__) == [i for _, i in expected if i in accept][:7]
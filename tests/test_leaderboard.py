@@ -0,0 +1,72 @@
+import bisect
+import random
+
+import pytest
+
+from leaderboard import IndexableSkiplist, ScoreBoard
+
+
+def test_skiplist_matches_sorted_list():
+    rng = random.Random(1)
+    skiplist, reference = IndexableSkiplist(), []
+    for _ in range(5000):
+        value = rng.randrange(300)  # plenty of duplicates
+        if reference and rng.random() < 0.4:
+            value = rng.choice(reference)
+            skiplist.remove(value)
+            reference.remove(value)
+        else:
+            skiplist.insert(value)
+            bisect.insort(reference, value)
+
+        probe = rng.randrange(-5, 305)
+        assert skiplist.count_less(probe) == bisect.bisect_left(reference, probe)
+        assert len(skiplist) == len(reference)
+        if reference:
+            index = rng.randrange(len(reference))
+            assert skiplist[index] == reference[index]
+            assert skiplist[-1] == reference[-1]
+            assert list(skiplist.iter_from(index))[:20] == reference[index:index + 20]
+    assert list(skiplist) == reference
+
+
+def test_skiplist_errors():
+    skiplist = IndexableSkiplist()
+    skiplist.insert(3)
+    with pytest.raises(ValueError):
+        skiplist.remove(4)
+    with pytest.raises(IndexError):
+        skiplist[1]
+    assert list(skiplist.iter_from(5)) == []
+
+
+def test_scoreboard_matches_sorted_reference():
+    rng = random.Random(2)
+    board, best = ScoreBoard(), {}
+    for _ in range(3000):
+        player, score = f"p{rng.randrange(200)}", rng.randrange(-50, 500)
+        improved = board.submit(player, score)
+        assert improved == (player not in best or score > best[player])
+        if improved:
+            best[player] = score
+
+    expected = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+    assert board.entries() == expected
+    assert board.top(10) == expected[:10]
+    assert board.entries(50, 60) == expected[50:60]
+    for position, (player, score) in enumerate(expected):
+        assert board.position(player) == position
+        assert board.rank_of(score) == 1 + sum(1 for _, s in expected if s > score)
+
+
+def test_scoreboard_set_and_discard():
+    board = ScoreBoard()
+    board.submit("a", 10)
+    board.submit("b", 20)
+    board.set("b", 5)  # unconditional, may lower the score
+    assert board.top(2) == [("a", 10), ("b", 5)]
+    board.discard("a")
+    board.discard("missing")
+    assert board.entries() == [("b", 5)]
+    assert board.position("a") is None
+    assert len(board) == 1
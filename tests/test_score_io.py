@@ -0,0 +1,70 @@
+import io
+import json
+
+import pytest
+
+from extensions import db
+from score_io import JsonStream, create_app, export_scores, import_scores, read_json_records
+
+
+class OneCharReader(io.StringIO):
+    """Returns at most one character per read(), whatever size is asked for."""
+
+    def read(self, size=-1):
+        return super().read(1)
+
+
+DOCUMENT = [
+    12345, -0.5, 1e21, "a,b]}", "中文 \"q\" \\", True, None, [], {},
+    {"name": "x", "score": 987654321, "nested": [1, [2, {"k": "v"}]]},
+]
+
+
+def test_stream_items_at_chunk_size_one():
+    text = json.dumps(DOCUMENT, ensure_ascii=False, indent=2)
+    assert list(JsonStream(io.StringIO(text), chunk_size=1).items()) == DOCUMENT
+
+
+def test_stream_members_at_chunk_size_one():
+    text = '{ "a" : 1 , "b":[10, 20],"c" : {"d": 123456} }'
+    stream = JsonStream(io.StringIO(text), chunk_size=1)
+    seen = {key: stream.value() for key in stream.members()}
+    assert seen == json.loads(text)
+
+
+def test_stream_rejects_truncated_input():
+    with pytest.raises(ValueError):
+        list(JsonStream(io.StringIO('[1, 2, {"a": '), chunk_size=1).items())
+
+
+@pytest.mark.parametrize("document, expected", [
+    ([10, 20], [("ball", "medium", "Unknown", 10), ("ball", "medium", "Unknown", 20)]),
+    ({"easy": [1, {"name": "z", "score": 3}]},
+     [("ball", "easy", "Unknown", 1), ("ball", "easy", "z", 3)]),
+    ({"snake": {"hard": [{"name": "b", "score": 5}], "easy": []}, "ball": {"medium": [7]}},
+     [("snake", "hard", "b", 5), ("ball", "medium", "Unknown", 7)]),
+    ([{"game": "g", "difficulty": "easy", "name": "n", "score": 1}], [("g", "easy", "n", 1)]),
+])
+def test_legacy_layouts(document, expected):
+    records = read_json_records(OneCharReader(json.dumps(document)))
+    assert [(r["game"], r["difficulty"], r["name"], r["score"]) for r in records] == expected
+
+
+def test_import_export_round_trip():
+    app = create_app("sqlite://")
+    legacy = {"ball": {"easy": [{"name": "a", "score": 5}, {"name": "a", "score": 9}, 4, "bad"]},
+              "snake": {"hard": [{"name": "b", "score": 2 ** 40}]}}
+    with app.app_context():
+        db.create_all()
+        imported, skipped = import_scores(io.StringIO(json.dumps(legacy)), "json", chunk_size=2)
+        assert (imported, skipped) == (3, 2)  # "bad" and the out-of-range score
+
+        out = io.StringIO()
+        assert export_scores(out, "ndjson", chunk_size=1) == 2
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert rows == [{"game": "ball", "difficulty": "easy", "name": "a", "score": 9},
+                        {"game": "ball", "difficulty": "easy", "name": "Unknown", "score": 4}]
+
+        out = io.StringIO()
+        export_scores(out, "json", chunk_size=1)
+        assert json.loads(out.getvalue()) == rows
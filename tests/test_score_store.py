@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import mysql
+
+from models import WindowScore
+from score_store import GAME_ID_MAX_LENGTH, SCORE_MAX, SCORE_MIN, prepare_score_submission, window_scores_upsert
+
+
+def window_row(period, score):
+    return {"kind": "daily", "game_id": "g", "difficulty": "easy", "player_name": "p",
+            "period": period, "score": score}
+
+
+def test_window_upsert_assigns_score_before_period_on_mysql():
+    stmt = window_scores_upsert([window_row("2026-10-16", 5)], dialect="mysql")
+    sql = str(stmt.compile(dialect=mysql.dialect()))
+    update = sql.split("ON DUPLICATE KEY UPDATE", 1)[1]
+    assert update.index("score = CASE") < update.index("period = VALUES(period)")
+
+
+def test_window_upsert_keeps_best_within_period_and_resets_on_new_one():
+    engine = create_engine("sqlite://")
+    WindowScore.__table__.create(engine)
+    with engine.begin() as conn:
+        def submit(period, score):
+            conn.execute(window_scores_upsert([window_row(period, score)], dialect="sqlite"))
+            return conn.execute(select(WindowScore.period, WindowScore.score)).one()
+
+        assert tuple(submit("2026-10-15", 100)) == ("2026-10-15", 100)
+        assert tuple(submit("2026-10-15", 40)) == ("2026-10-15", 100)
+        assert tuple(submit("2026-10-16", 5)) == ("2026-10-16", 5)
+        assert tuple(submit("2026-10-16", 9)) == ("2026-10-16", 9)
+
+
+@pytest.mark.parametrize("score", [SCORE_MAX + 1, SCORE_MIN - 1, 10 ** 20, float("inf"), "x", None])
+def test_prepare_rejects_scores_the_column_cannot_hold(score):
+    entry, error = prepare_score_submission("g", "easy", "p", score)
+    assert entry is None and error
+
+
+def test_prepare_normalizes_entry():
+    entry, error = prepare_score_submission("g", "nightmare", "", "42")
+    assert error is None
+    assert entry == ("g", "medium", "匿名玩家", 42)
+
+
+def test_prepare_rejects_game_ids_the_column_cannot_hold():
+    assert prepare_score_submission("g" * GAME_ID_MAX_LENGTH, "easy", "p", 1)[1] is None
+    entry, error = prepare_score_submission("g" * (GAME_ID_MAX_LENGTH + 1), "easy", "p", 1)
+    assert entry is None and error
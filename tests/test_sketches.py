@@ -0,0 +1,119 @@
+import math
+import random
+
+import pytest
+
+from sketches import HyperLogLog, ScoreHistogram
+
+
+def test_histogram_bounds_partition_the_integers():
+    histogram = ScoreHistogram()
+    previous_high = None
+    for index in range(histogram.size):
+        low, high = histogram.bounds(index)
+        if low > high:
+            continue  # bin too narrow to hold an integer
+        assert histogram.bin_of(low) == index
+        assert histogram.bin_of(high) == index
+        if previous_high is not None:
+            assert low == previous_high + 1  # no gaps, no overlaps
+        previous_high = high
+    assert histogram.bounds(0)[0] == -histogram.max_value
+    assert previous_high == histogram.max_value
+    # values beyond max_value are clamped into the outermost bins
+    assert histogram.bin_of(10 ** 12) == histogram.size - 1
+    assert histogram.bin_of(-10 ** 12) == 0
+
+
+def test_histogram_matches_sorted_reference():
+    rng = random.Random(3)
+    histogram, values = ScoreHistogram(), []
+    for _ in range(4000):
+        # heavy-tailed, within the range of the scores column
+        value = int(rng.choice((1, -1)) * min(rng.paretovariate(0.3), 2 ** 31 - 1)) if rng.random() < 0.9 else 0
+        histogram.add(value)
+        values.append(value)
+    for value in rng.sample(values, 1000):
+        histogram.remove(value)
+        values.remove(value)
+    values.sort()
+    assert len(histogram) == len(values)
+
+    for probe in rng.sample(values, 200) + [-10 ** 9, 0, 10 ** 9]:
+        expected = sum(1 for v in values if histogram.bin_of(v) < histogram.bin_of(probe))
+        assert histogram.count_below(probe) == expected
+        low = histogram.bounds(histogram.bin_of(probe))[0]
+        assert sum(1 for v in values if v < low) == expected
+
+    for q in (0, 0.01, 0.25, 0.5, 0.9, 0.99, 1):
+        target = min(max(math.ceil(q * len(values)), 1), len(values))
+        assert histogram.quantile(q) == histogram.bounds(histogram.bin_of(values[target - 1]))[1]
+
+    buckets = histogram.buckets(20)
+    assert len(buckets) <= 20
+    assert sum(b["count"] for b in buckets) == len(values)
+    assert buckets[0]["min"] <= values[0] and buckets[-1]["max"] >= values[-1]
+
+
+def test_histogram_remove_missing_value_leaves_counts_untouched():
+    histogram = ScoreHistogram()
+    histogram.add(100)
+    with pytest.raises(ValueError):
+        histogram.remove(-100)
+    assert len(histogram) == 1 and histogram.count_below(101) == 0
+
+
+def test_histogram_merge_and_serialization_round_trip():
+    a, b = ScoreHistogram(), ScoreHistogram()
+    for value in range(-500, 500, 7):
+        a.add(value)
+        b.add(value * 3)
+    a.merge(b)
+    restored = ScoreHistogram.from_bytes(a.to_bytes())
+    assert len(restored) == len(a)
+    assert restored.buckets(50) == a.buckets(50)
+    with pytest.raises(ValueError):
+        a.merge(ScoreHistogram(gamma=1.1))
+
+
+@pytest.mark.parametrize("cardinality", [0, 1, 10, 100, 1000, 5000, 20000, 100000])
+def test_hyperloglog_estimate_error(cardinality):
+    sketch = HyperLogLog()
+    for i in range(cardinality):
+        sketch.add(f"10.{i >> 16}.{(i >> 8) & 255}.{i & 255}")
+        if i % 3 == 0:
+            sketch.add(f"10.{i >> 16}.{(i >> 8) & 255}.{i & 255}")  # repeats do not count
+    # standard error is 1.04 / sqrt(2048) ~ 2.3%; allow four of them
+    assert abs(sketch.estimate() - cardinality) <= max(2, 0.092 * cardinality)
+
+
+def test_hyperloglog_merge_equals_sketch_of_the_union():
+    a, b, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    for i in range(3000):
+        a.add(f"a{i}")
+        union.add(f"a{i}")
+    for i in range(1500, 6000):
+        b.add(f"a{i}")
+        union.add(f"a{i}")
+    assert a.merge(b) is True
+    assert a.to_bytes() == union.to_bytes()
+    assert a.estimate() == union.estimate()
+    assert a.merge(b) is False  # idempotent
+    with pytest.raises(ValueError):
+        a.merge(HyperLogLog(precision=10))
+
+
+def test_hyperloglog_serialization_round_trip():
+    sketch = HyperLogLog(precision=12)
+    for i in range(777):
+        sketch.add(str(i))
+    data = sketch.to_bytes()
+    assert len(data) == 4096
+    restored = HyperLogLog.from_bytes(data)
+    assert restored.precision == 12
+    assert restored.to_bytes() == data and restored.estimate() == sketch.estimate()
+    assert restored.add("0") is False  # already counted
+    with pytest.raises(ValueError):
+        HyperLogLog.from_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=3)
@@ -0,0 +1,69 @@
+"""Exponentially decayed "trending" scores maintained incrementally.
+
+A click at time ``t`` is worth ``2 ** (-(now - t) / half_life)`` clicks at
+``now``.  Because every score decays by the same factor, the ranking only
+changes when clicks arrive, so scores are stored relative to a fixed origin
+(``2 ** (t / half_life)``) and never have to be re-decayed.  They are kept as
+base-2 logarithms so the growing exponent cannot overflow a float.
+"""
+import math
+from typing import Callable, Optional
+
+from catalog import SortedIndex
+
+__all__ = [
+    'TrendingIndex',
+]
+
+
+class TrendingIndex:
+    """Item id -> decayed click score, ordered highest first.
+
+    Not thread-safe; callers guard it with their own lock (like ``SortedIndex``).
+
+    Parameters
+    ----------
+    half_life : float
+        Seconds after which a click counts half as much.
+    """
+
+    def __init__(self, half_life: float):
+        self.half_life = half_life
+        self._log_scores: dict[str, float] = {}
+        self._order = SortedIndex()  # key: (-log2 score,)
+
+    def __len__(self) -> int:
+        return len(self._log_scores)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._log_scores
+
+    def add(self, item_id: str, count: int, at: float):
+        """Credit ``count`` clicks that happened at epoch second ``at``."""
+        if count <= 0:
+            return
+        contribution = at / self.half_life + math.log2(count)
+        current = self._log_scores.get(item_id)
+        if current is None:
+            value = contribution
+        else:
+            # log2(2**a + 2**b) without leaving log space
+            high, low = max(current, contribution), min(current, contribution)
+            value = high + math.log2(1.0 + 2.0 ** (low - high))
+        self._log_scores[item_id] = value
+        self._order.update(item_id, (-value,))
+
+    def discard(self, item_id: str):
+        if self._log_scores.pop(item_id, None) is not None:
+            self._order.discard(item_id)
+
+    def score(self, item_id: str, now: float) -> float:
+        """Decayed click count of ``item_id`` as seen at ``now`` (0 if never clicked)."""
+        value = self._log_scores.get(item_id)
+        if value is None:
+            return 0.0
+        return 2.0 ** (value - now / self.half_life)
+
+    def head(self, k: int, accept: Optional[Callable[[str], bool]] = None) -> list[str]:
+        """Ids of the ``k`` highest-scoring items."""
+        return self._order.head(k, accept=accept)